@@ -4,6 +4,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from bleak import BleakClient
 import asyncio
 import json
+import struct
+from collections import deque
 from typing import Dict, Any, Optional, List
 from pydantic import BaseModel, Field
 
@@ -60,6 +62,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Binary stream settings (/ws/stream)
+STREAM_FRAME = struct.Struct("5B")  # device index, red, green, blue, brightness
+STREAM_JITTER_BUFFER_FRAMES = 2  # frames buffered per device before the oldest is dropped
+STREAM_BROADCAST_INTERVAL = 1.0  # seconds between state broadcasts while streaming
+
 class LEDController:
     """Enhanced LED Controller with additional features and state management"""
     
@@ -121,12 +128,12 @@ class LEDController:
             return True  # Reconnected
         return False  # Already connected
             
-    async def _write_command(self, data: bytes):
+    async def _write_command(self, data: bytes, response: Optional[bool] = None):
         try:
             if not await self.is_connected():
                 print(f"Attempting to reconnect to {self.device_address}...")
                 await self.connect()
-            await self.client.write_gatt_char(self.UART_RX_CHAR_UUID, data)
+            await self.client.write_gatt_char(self.UART_RX_CHAR_UUID, data, response=response)
             # Store last command for potential retry
             self.last_command = data
             self.state.last_updated = asyncio.get_event_loop().time()
@@ -189,6 +196,23 @@ class LEDController:
         self.state.mic_sensitivity = sensitivity
         self.state.mic_scaling = scaling
     
+    # Streaming Controls
+    async def stream_frame(self, red: int, green: int, blue: int, brightness: int, force_brightness: bool = False):
+        """
+        Write a streamed color frame without waiting for a write response
+        Brightness is a separate command, so it is only sent when it changes
+        or when force_brightness is set
+        """
+        if force_brightness or brightness != self.state.brightness:
+            command = bytes.fromhex(f'5A0301{brightness:02X}{self.state.intensity:02X}')
+            await self._write_command(command, response=False)
+            self.state.brightness = brightness
+        command = bytes.fromhex(f'5A0701{red:02X}{green:02X}{blue:02X}')
+        await self._write_command(command, response=False)
+        self.state.red = red
+        self.state.green = green
+        self.state.blue = blue
+    
     def get_state(self) -> Dict[str, Any]:
         """Return the current state as a dictionary"""
         return {
@@ -650,6 +674,154 @@ async def broadcast_other_clients(current_websocket: WebSocket, device_address:
     except Exception as e:
         print(f"Error broadcasting to other clients: {e}")
 
+class StreamWriter:
+    """Per-device writer for binary stream frames with latest-frame-wins semantics"""
+    
+    def __init__(self, device_address: str):
+        self.device_address = device_address
+        # Small jitter buffer: bursts are played out in order, but once it is
+        # full a new frame pushes out the oldest one so the newest always wins
+        self.frames = deque(maxlen=STREAM_JITTER_BUFFER_FRAMES)
+        self.frame_ready = asyncio.Event()
+        self.closing = False
+        # The strip's real brightness is unknown, so always send it on the first frame
+        self.brightness_sent = False
+        self.last_broadcast = 0.0
+        self.pending_broadcast = False
+        self.broadcast_task: Optional[asyncio.Task] = None
+        self.task = asyncio.create_task(self.run())
+    
+    def push(self, red: int, green: int, blue: int, brightness: int):
+        self.frames.append((red, green, blue, brightness))
+        self.frame_ready.set()
+    
+    async def run(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            try:
+                await asyncio.wait_for(self.frame_ready.wait(), timeout=STREAM_BROADCAST_INTERVAL)
+            except asyncio.TimeoutError:
+                # Stream went idle, let observers catch up with the last frame
+                if self.pending_broadcast:
+                    self.schedule_broadcast()
+                continue
+            self.frame_ready.clear()
+            
+            while self.frames:
+                if self.closing:
+                    # Client is gone, only the newest frame still matters
+                    frame = self.frames.pop()
+                    self.frames.clear()
+                else:
+                    frame = self.frames.popleft()
+                await self.write(*frame)
+                
+                # Throttle state broadcasts for passive observers
+                if self.pending_broadcast and loop.time() - self.last_broadcast >= STREAM_BROADCAST_INTERVAL:
+                    self.schedule_broadcast()
+            
+            if self.closing:
+                break
+    
+    async def write(self, red: int, green: int, blue: int, brightness: int):
+        try:
+            controller = await get_controller(self.device_address)
+            await controller.stream_frame(red, green, blue, brightness, force_brightness=not self.brightness_sent)
+        except Exception as e:
+            print(f"Error writing stream frame to {self.device_address}: {e}")
+            return
+        self.brightness_sent = True
+        self.pending_broadcast = True
+    
+    def schedule_broadcast(self):
+        """Broadcast in the background so slow observers never hold up frame writes"""
+        if self.broadcast_task and not self.broadcast_task.done():
+            return  # Still sending the previous update, retry on the next frame
+        self.pending_broadcast = False
+        self.last_broadcast = asyncio.get_event_loop().time()
+        self.broadcast_task = asyncio.create_task(broadcast_state_update(self.device_address))
+    
+    async def close(self):
+        """Write the newest buffered frame, then send a final state update"""
+        self.closing = True
+        self.frame_ready.set()
+        await self.task
+        if self.broadcast_task:
+            await self.broadcast_task
+        if self.pending_broadcast:
+            self.pending_broadcast = False
+            await broadcast_state_update(self.device_address)
+
+# Active stream writers, one per device
+stream_writers: Dict[str, StreamWriter] = {}
+
+# Binary streaming endpoint for screen sync and audio-reactive clients
+@app.websocket("/ws/stream")
+async def stream_endpoint(websocket: WebSocket, devices: str = ""):
+    """
+    Stream color frames as binary messages
+    devices: comma-separated device addresses, a frame's device index refers to this list
+    Each frame is 5 bytes (device index, red, green, blue, brightness); a message may
+    contain several frames. No per-frame responses are sent.
+    """
+    await websocket.accept()
+    # Drop duplicate addresses so each device has a single writer
+    device_addresses = list(dict.fromkeys(addr.strip() for addr in devices.split(",") if addr.strip()))
+    
+    if not device_addresses:
+        await websocket.send_text(json.dumps({
+            "status": "error",
+            "message": "Missing devices query parameter"
+        }))
+        await websocket.close()
+        return
+    
+    busy = [addr for addr in device_addresses if addr in stream_writers]
+    if busy:
+        await websocket.send_text(json.dumps({
+            "status": "error",
+            "message": f"Already streaming to {', '.join(busy)}"
+        }))
+        await websocket.close()
+        return
+    
+    writers = [StreamWriter(addr) for addr in device_addresses]
+    for writer in writers:
+        stream_writers[writer.device_address] = writer
+    
+    try:
+        await websocket.send_text(json.dumps({
+            "type": "stream_ready",
+            "devices": device_addresses,
+            "frame_size": STREAM_FRAME.size
+        }))
+        
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            
+            data = message.get("bytes")
+            if not data or len(data) % STREAM_FRAME.size:
+                # Ignore text messages and truncated frames
+                continue
+            
+            for index, red, green, blue, brightness in STREAM_FRAME.iter_unpack(data):
+                if index < len(writers):
+                    writers[index].push(red, green, blue, brightness)
+    
+    except WebSocketDisconnect:
+        pass
+    
+    except Exception as e:
+        print(f"Stream WebSocket error: {e}")
+    
+    finally:
+        for writer in writers:
+            await writer.close()
+            del stream_writers[writer.device_address]
+        print("Stream WebSocket connection closed and cleaned up")
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up all device connections when the server shuts down"""